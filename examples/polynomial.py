@@ -5,30 +5,15 @@ from mobo.filter import ParetoFilter, PercentileFilter
 from mobo.optimize import Optimizer
 from mobo.parameter import Parameter
 from mobo.projection import PCAProjector
-from mobo.qoi import QoI
+from mobo.qoi import QoIGroup
 
 # target coefficients: 0.3, -1.2, 0.5
 polynomial = lambda a, b, c, x: a*x**3 + b*x**2 + c*x
 
-# target: -0.062
-def evaluate_pt0(params):
-    x = -0.1
-    return polynomial(params["a"], params["b"], params["c"], x)
-
-# target: 0.05
-def evaluate_pt1(params):
-    x = 0.3
-    return polynomial(params["a"], params["b"], params["c"], x)
-
-# target: -1.4
-def evaluate_pt2(params):
-    x = 2.0
-    return polynomial(params["a"], params["b"], params["c"], x)
-
-# target: 2.0
-def evaluate_pt3(params):
-    x = 4.0
-    return polynomial(params["a"], params["b"], params["c"], x)
+# targets: -0.062, 0.05, -1.4, 2.0
+def evaluate_pts(params):
+    xs = [-0.1, 0.3, 2.0, 4.0]
+    return [polynomial(params["a"], params["b"], params["c"], x) for x in xs]
 
 
 if __name__ == "__main__":
@@ -45,10 +30,11 @@ if __name__ == "__main__":
 
     # construct qois
     qois = [
-        QoI("pt0", evaluate_pt0, -0.062),
-        QoI("pt1", evaluate_pt1, 0.05),
-        QoI("pt2", evaluate_pt2, -1.4),
-        QoI("pt3", evaluate_pt3, 2.0)
+        QoIGroup(
+            ["pt0", "pt1", "pt2", "pt3"], 
+            evaluate_pts, 
+            [-0.062, 0.05, -1.4, 2.0]
+        )
     ]
 
     n_iterations = 6  # number of iterations to evolve through
@@ -0,0 +1,137 @@
+from abc import ABC
+import numpy as np
+from typing import Optional
+
+
+class BaseAllocator(ABC):
+    """Abstract base class for Allocators.
+
+    Notes:
+        - `sizes` is the number of members of each cluster.
+        - `survivors` is the number of members of each cluster which were
+          drawn from the previous model and survived filtration.
+        - `draws` is the number of samples drawn from the previous model,
+          including those which were filtered out, which are attributed to
+          each cluster by the cluster of their nearest member.
+        - Returns the number of samples to draw from each cluster which
+          always sums to exactly `n_samples`.
+    """
+    def __call__(self,
+                 n_samples: int,
+                 sizes: np.ndarray,
+                 survivors: np.ndarray,
+                 draws: np.ndarray) -> np.ndarray:
+        pass
+
+
+class BanditAllocator(BaseAllocator):
+    """Thompson sampling allocator.
+
+    Notes:
+        - Each cluster is weighted by a draw from a beta distribution over
+          its survival rate. The prior is centred on the pooled survival 
+          rate of every cluster so that clusters without history are 
+          explored, but are not favoured over productive clusters.
+
+    Args:
+        prior_weight: Number of draws the prior is worth.
+        random_state: Seed of the random number generator.
+    """
+    def __init__(self,
+                 prior_weight: float = 2.0,
+                 random_state: Optional[int] = None) -> None:
+        if prior_weight <= 0:
+            err = "`prior_weight` must be positive."
+            raise ValueError(err)
+        self._prior_weight = prior_weight
+        self._rng = np.random.RandomState(random_state)
+
+    def __call__(self,
+                 n_samples: int,
+                 sizes: np.ndarray,
+                 survivors: np.ndarray,
+                 draws: np.ndarray) -> np.ndarray:
+        failures = np.maximum(draws - survivors, 0)
+        # both shape parameters of the prior must be positive
+        rate = np.clip(_pooled_rate(survivors, draws), 0.01, 0.99)
+        weights = self._rng.beta(
+            self._prior_weight * rate + survivors,
+            self._prior_weight * (1 - rate) + failures
+        )
+        return _apportion(n_samples, weights)
+
+
+class SizeAllocator(BaseAllocator):
+    """Allocator proportional to the size of each cluster."""
+    def __call__(self,
+                 n_samples: int,
+                 sizes: np.ndarray,
+                 survivors: np.ndarray,
+                 draws: np.ndarray) -> np.ndarray:
+        return _apportion(n_samples, sizes)
+
+
+class SurvivalAllocator(BaseAllocator):
+    """Allocator proportional to the survival rate of each cluster.
+
+    Notes:
+        - Survival rates are smoothed towards the pooled survival rate of 
+          every cluster so that clusters without history are assigned the 
+          pooled rate.
+
+    Args:
+        prior_weight: Number of draws the pooled rate is worth.
+    """
+    def __init__(self, prior_weight: float = 2.0) -> None:
+        if prior_weight < 0:
+            err = "`prior_weight` must not be negative."
+            raise ValueError(err)
+        self._prior_weight = prior_weight
+
+    def __call__(self,
+                 n_samples: int,
+                 sizes: np.ndarray,
+                 survivors: np.ndarray,
+                 draws: np.ndarray) -> np.ndarray:
+        rate = _pooled_rate(survivors, draws)
+        rates = np.full(len(sizes), rate)
+        # clusters without draws keep the pooled rate
+        drawn = (draws + self._prior_weight) > 0
+        rates[drawn] = (
+            (survivors[drawn] + self._prior_weight * rate) /
+            (draws[drawn] + self._prior_weight)
+        )
+        return _apportion(n_samples, rates)
+
+
+class UniformAllocator(BaseAllocator):
+    """Allocator of an equal share to each cluster."""
+    def __call__(self,
+                 n_samples: int,
+                 sizes: np.ndarray,
+                 survivors: np.ndarray,
+                 draws: np.ndarray) -> np.ndarray:
+        return _apportion(n_samples, np.ones(len(sizes)))
+
+
+def _apportion(n_samples: int, weights: np.ndarray) -> np.ndarray:
+    """Split samples proportionally to weights by the largest remainder."""
+    weights = np.asarray(weights, dtype=float)
+    if len(weights) == 0:
+        return np.zeros(0, dtype=int)
+    if not np.sum(weights) > 0:
+        weights = np.ones(len(weights))
+    quotas = n_samples * weights / np.sum(weights)
+    allocation = np.floor(quotas).astype(int)
+    remainder = n_samples - np.sum(allocation)
+    order = np.argsort(allocation - quotas, kind="stable")
+    allocation[order[:remainder]] += 1
+    return allocation
+
+
+def _pooled_rate(survivors: np.ndarray, draws: np.ndarray) -> float:
+    """Survival rate of every cluster combined."""
+    n_draws = np.sum(draws)
+    if not n_draws > 0:
+        return 0.5
+    return min(float(np.sum(survivors) / n_draws), 1.0)
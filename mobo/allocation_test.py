@@ -0,0 +1,42 @@
+from mobo.allocation import BanditAllocator, SizeAllocator
+from mobo.allocation import SurvivalAllocator, UniformAllocator
+import numpy as np
+
+N_SAMPLES = 1001
+SIZES = np.array([500, 300, 20])
+SURVIVORS = np.array([10, 40, 0])
+DRAWS = np.array([400, 100, 0])
+
+
+def test_bandit_allocator():
+    bandit = BanditAllocator(random_state=0)
+    allocation = bandit(N_SAMPLES, SIZES, SURVIVORS, DRAWS)
+    assert np.sum(allocation) == N_SAMPLES
+    assert np.all(allocation >= 0)
+    # clusters without history are explored less than productive clusters
+    mean = np.mean([
+        bandit(N_SAMPLES, SIZES, SURVIVORS, DRAWS) for _ in range(100)
+    ], axis=0)
+    assert mean[1] > mean[2] > mean[0]
+
+
+def test_size_allocator():
+    size = SizeAllocator()
+    allocation = size(N_SAMPLES, SIZES, SURVIVORS, DRAWS)
+    assert np.sum(allocation) == N_SAMPLES
+    assert allocation[0] > allocation[1] > allocation[2]
+
+
+def test_survival_allocator():
+    survival = SurvivalAllocator()
+    allocation = survival(N_SAMPLES, SIZES, SURVIVORS, DRAWS)
+    assert np.sum(allocation) == N_SAMPLES
+    # clusters without history are assigned the pooled rate
+    assert allocation[1] > allocation[2] > allocation[0]
+
+
+def test_uniform_allocator():
+    uniform = UniformAllocator()
+    allocation = uniform(N_SAMPLES, SIZES, SURVIVORS, DRAWS)
+    assert np.sum(allocation) == N_SAMPLES
+    assert np.max(allocation) - np.min(allocation) <= 1
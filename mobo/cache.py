@@ -0,0 +1,128 @@
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+from functools import partial
+from mobo.qoi import QoI, QoIGroup
+import numpy as np
+from threading import Lock
+from typing import Hashable, Optional, Tuple, Union
+
+
+class EvaluationCache(object):
+    """Thread-safe store of qoi evaluations shared between optimizations.
+
+    Notes:
+        - Evaluations are identified by the evaluator, the names of the qois
+          and the parameterization, so qois which differ only in their
+          targets share evaluations.
+        - A parameterization requested while it is still being evaluated
+          waits for that evaluation rather than repeating it.
+        - Once `max_size` evaluations are cached the least recently used
+          evaluation is evicted for each new one.
+
+    Args:
+        max_size: Maximum number of cached evaluations or None for no limit.
+    """
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        if max_size is not None and max_size < 1:
+            err = "`max_size` must be at least 1."
+            raise ValueError(err)
+        self.max_size = max_size
+        self._futures: "OrderedDict[Hashable, Future]" = OrderedDict()
+        self._lock = Lock()
+        self.n_hits = 0
+        self.n_misses = 0
+
+    def __call__(self,
+                 qoi: Union[QoI, QoIGroup],
+                 parameterization: dict) -> Tuple[np.ndarray, bool]:
+        """Returns the values of a qoi and whether they were cached.
+
+        Args:
+            qoi: QoI or QoIGroup to evaluate.
+            parameterization: Mapping of parameter names to values.
+        """
+        future, cached = self.submit(qoi, parameterization)
+        return future.result(), cached
+
+    def submit(self,
+               qoi: Union[QoI, QoIGroup],
+               parameterization: dict,
+               executor: Optional[Executor] = None) -> Tuple[Future, bool]:
+        """Returns a future of the values of a qoi and whether it was cached.
+
+        Args:
+            qoi: QoI or QoIGroup to evaluate.
+            parameterization: Mapping of parameter names to values.
+            executor: Executor to evaluate uncached values with.
+        """
+        key = (
+            qoi.evaluator,
+            tuple(qoi.names),
+            tuple(sorted(parameterization.items()))
+        )
+        with self._lock:
+            future = self._futures.get(key)
+            cached = future is not None
+            if future is None:
+                future = Future()
+                self._futures[key] = future
+                self.n_misses += 1
+                if self.max_size is not None and len(self._futures) > self.max_size:
+                    self._futures.popitem(last=False)
+            else:
+                self._futures.move_to_end(key)
+                self.n_hits += 1
+        if not cached:
+            # failed evaluations are not cached
+            future.add_done_callback(partial(self._discard_failure, key))
+            evaluation = submit_evaluation(qoi, parameterization, executor)
+            evaluation.add_done_callback(partial(_resolve, future))
+        return future, cached
+
+    def _discard_failure(self, key: Hashable, future: Future) -> None:
+        """Remove a failed evaluation from the cache."""
+        if future.cancelled() or future.exception() is not None:
+            with self._lock:
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+
+
+def submit_evaluation(qoi: Union[QoI, QoIGroup],
+                      parameterization: dict,
+                      executor: Optional[Executor] = None) -> Future:
+    """Returns a future of the values of a qoi.
+
+    Notes:
+        - Only the qoi is sent to the executor, so process pools may be 
+          used when its evaluator can be pickled.
+
+    Args:
+        qoi: QoI or QoIGroup to evaluate.
+        parameterization: Mapping of parameter names to values.
+        executor: Executor to evaluate with or None to evaluate immediately.
+    """
+    if executor is not None:
+        return executor.submit(qoi.evaluate, parameterization)
+    future: Future = Future()
+    _evaluate_into(future, qoi, parameterization)
+    return future
+
+
+def _resolve(future: Future, source: Future) -> None:
+    """Resolve a future with the outcome of another."""
+    if source.cancelled():
+        future.cancel()
+    elif source.exception() is not None:
+        future.set_exception(source.exception())
+    else:
+        future.set_result(source.result())
+
+
+def _evaluate_into(future: Future,
+                   qoi: Union[QoI, QoIGroup],
+                   parameterization: dict) -> None:
+    """Evaluate a qoi in the calling thread and resolve a future with it."""
+    try:
+        future.set_result(qoi.evaluate(parameterization))
+    except Exception as e:
+        future.set_exception(e)
@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+from mobo.cache import EvaluationCache
+from mobo.qoi import QoI
+import numpy as np
+import pytest
+import time
+
+
+def test_evaluation_cache():
+    calls = []
+    def evaluator(params):
+        calls.append(params)
+        time.sleep(0.01)
+        return params["x"]
+    cache = EvaluationCache()
+    qoi = QoI("x", evaluator, 0.0)
+    # qois differing only in their target share evaluations
+    other = QoI("x", evaluator, 1.0)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(
+            lambda q: cache(q, {"x": 1.0}), [qoi, other, qoi, other]
+        ))
+    assert len(calls) == 1
+    assert sum(cached for _, cached in results) == 3
+    assert all(np.array_equal(values, [1.0]) for values, _ in results)
+    _, cached = cache(qoi, {"x": 2.0})
+    assert not cached
+    assert cache.n_hits == 3 and cache.n_misses == 2
+
+
+def test_evaluation_cache_error():
+    def evaluator(params):
+        raise RuntimeError
+    cache = EvaluationCache()
+    qoi = QoI("x", evaluator, 0.0)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            _ = cache(qoi, {"x": 1.0})
+    assert cache.n_misses == 2
+
+
+def test_evaluation_cache_eviction():
+    calls = []
+    def evaluator(params):
+        calls.append(params)
+        return params["x"]
+    cache = EvaluationCache(max_size=2)
+    qoi = QoI("x", evaluator, 0.0)
+    for x in [1.0, 2.0, 1.0, 3.0]:
+        _ = cache(qoi, {"x": x})
+    # the least recently used evaluation is evicted
+    assert len(calls) == 3
+    _, cached = cache(qoi, {"x": 1.0})
+    assert cached
+    _, cached = cache(qoi, {"x": 2.0})
+    assert not cached
+    with pytest.raises(ValueError):
+        _ = EvaluationCache(max_size=0)
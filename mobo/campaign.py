@@ -0,0 +1,157 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+import copy
+from datetime import datetime
+from mobo.cache import EvaluationCache
+from mobo.configuration import GlobalConfiguration
+from mobo.log import Logger
+from mobo.optimize import Optimizer
+import os
+import pandas as pd
+from typing import Dict, Hashable, List, Optional
+
+
+class Campaign(object):
+    """Collection of optimizations run concurrently with shared resources.
+
+    Notes:
+        - Every optimization evaluates its parameterizations on one shared
+          pool of workers and shares evaluations of identical
+          parameterizations through an `EvaluationCache`.
+        - Optimizations without initial data which fit the same parameters
+          start from the same initial parameter distributions.
+        - Each optimization runs on a copy of its local configurations, so
+          configurations may share clusterers and projectors.
+        - Workers are threads by default, which only evaluate in parallel
+          when the evaluators release the GIL (e.g. by running an external
+          program). Evaluators written in pure python should use process
+          workers, which require evaluators which can be pickled (e.g. 
+          module level functions).
+        - At most `cache_size` evaluations are cached. The least recently
+          used evaluations are evicted first.
+        - Each optimization exports its data and log to its own directory
+          within `output_dir`.
+
+    Args:
+        configurations: Configuration of each optimization.
+        n_workers: Number of evaluations to run concurrently.
+        output_dir: Directory to write the output of the campaign to.
+        names: Name of each optimization.
+        cache_size: Maximum number of cached evaluations or None for no limit.
+        worker_type: Type of the workers, either "thread" or "process".
+    """
+    def __init__(self,
+                 configurations: List[GlobalConfiguration],
+                 n_workers: int = 4,
+                 output_dir: str = "mobo_campaign",
+                 names: Optional[List[str]] = None,
+                 cache_size: Optional[int] = 100000,
+                 worker_type: str = "thread") -> None:
+        if len(configurations) == 0:
+            err = "`configurations` must not be empty."
+            raise ValueError(err)
+        if names is None:
+            names = ["run_{}".format(i) for i in range(len(configurations))]
+        if len(names) != len(configurations):
+            err = "`names` and `configurations` must have the same length."
+            raise ValueError(err)
+        if len(set(names)) != len(names):
+            err = "`names` must be unique."
+            raise ValueError(err)
+        if n_workers < 1:
+            err = "`n_workers` must be at least 1."
+            raise ValueError(err)
+        if worker_type not in ("thread", "process"):
+            err = "`worker_type` must be either 'thread' or 'process'."
+            raise ValueError(err)
+        self.configurations = configurations
+        self.n_workers = n_workers
+        self.worker_type = worker_type
+        self.output_dir = output_dir
+        self.names = names
+        self.cache = EvaluationCache(max_size=cache_size)
+
+    def __call__(self) -> pd.DataFrame:
+        """Runs each optimization and returns a summary of the campaign."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        configurations = self._prepare_configurations()
+        summaries: List[dict] = []
+        workers: Executor
+        if self.worker_type == "process":
+            workers = ProcessPoolExecutor(max_workers=self.n_workers)
+        else:
+            workers = ThreadPoolExecutor(max_workers=self.n_workers)
+        with workers:
+            optimizers = [
+                Optimizer(configuration, executor=workers, cache=self.cache)
+                for configuration in configurations
+            ]
+            # each optimization is driven from its own thread
+            with ThreadPoolExecutor(max_workers=len(optimizers)) as drivers:
+                futures = [
+                    drivers.submit(self._run, name, optimizer)
+                    for name, optimizer in zip(self.names, optimizers)
+                ]
+                summaries = [future.result() for future in futures]
+        summary = pd.DataFrame(summaries)
+        summary.to_csv(os.path.join(self.output_dir, "summary.csv"), index=False)
+        return summary
+
+    def _prepare_configurations(self) -> List[GlobalConfiguration]:
+        """Copy each configuration with its own output and initial data."""
+        initial_data_paths: Dict[Hashable, str] = {}
+        configurations = []
+        for name, configuration in zip(self.names, self.configurations):
+            configuration = copy.copy(configuration)
+            # estimators are fit in place so each optimization needs its own
+            configuration.local_configurations = copy.deepcopy(
+                configuration.local_configurations
+            )
+            output_dir = os.path.join(self.output_dir, name)
+            os.makedirs(output_dir, exist_ok=True)
+            configuration.output_dir = output_dir
+            if configuration.logger is None:
+                configuration.logger = Logger(os.path.join(output_dir, "mobo.log"))
+            if configuration.initial_data_path is None:
+                key = (
+                    tuple(
+                        (p.name, p.lower_bound, p.upper_bound)
+                        for p in configuration.parameters
+                    ),
+                    tuple(n for q in configuration.qois for n in q.names),
+                    configuration.n_samples,
+                    configuration.dtype
+                )
+                if key not in initial_data_paths:
+                    path = os.path.join(
+                        self.output_dir,
+                        "initial_data_{}.csv".format(len(initial_data_paths))
+                    )
+                    self._write_initial_data(configuration, path)
+                    initial_data_paths[key] = path
+                configuration.initial_data_path = initial_data_paths[key]
+            configurations.append(configuration)
+        return configurations
+
+    def _write_initial_data(self,
+                            configuration: GlobalConfiguration,
+                            path: str) -> None:
+        """Write initial parameter distributions to be shared."""
+        optimizer = Optimizer(configuration)
+        df = optimizer._empty_dataframe(configuration.n_samples)
+        init_dist = optimizer._generate_initial_parameter_distributions()
+        df[optimizer.parameter_headers] = init_dist
+        df.to_csv(path, index=False)
+
+    def _run(self, name: str, optimizer: Optimizer) -> dict:
+        """Run an optimization and summarize it."""
+        start = datetime.now()
+        optimizer()
+        end = datetime.now()
+        return {
+            "name": name,
+            "output_dir": optimizer.configuration.output_dir,
+            "wall_time": round((end - start).total_seconds(), 3),
+            "n_evaluations": optimizer.n_evaluations,
+            "n_cached_evaluations": optimizer.n_cached_evaluations
+        }
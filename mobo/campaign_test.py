@@ -0,0 +1,109 @@
+from mobo.campaign import Campaign
+from mobo.cluster import DbscanClusterer
+from mobo.configuration import GlobalConfiguration, LocalConfiguration
+from mobo.error import AbsoluteErrorCalculator
+from mobo.filter import PercentileFilter
+from mobo.parameter import Parameter
+from mobo.projection import PCAProjector
+from mobo.qoi import QoIGroup
+import os
+import pytest
+
+NROWS = 100
+PARAMETERS = [Parameter("x", -1.0, 1.0), Parameter("y", -1.0, 1.0)]
+
+
+def _evaluate_xy(params):
+    return [params["x"], params["y"]]
+
+
+def _configuration(qois, filters, clusterer=None):
+    local_configuration = LocalConfiguration(
+        n_samples=NROWS,
+        clusterer=clusterer or DbscanClusterer(),
+        error_calculator=AbsoluteErrorCalculator(),
+        filters=filters,
+        projector=PCAProjector()
+    )
+    return GlobalConfiguration(
+        n_samples=NROWS,
+        local_configurations=[local_configuration, local_configuration],
+        parameters=PARAMETERS,
+        qois=qois
+    )
+
+
+def test_campaign(tmp_path):
+    calls = []
+    def evaluator(params):
+        calls.append(params)
+        return [params["x"], params["y"]]
+    qois = [QoIGroup(["qoi_x", "qoi_y"], evaluator, [0.0, 0.0])]
+    configurations = [
+        _configuration(qois, [PercentileFilter(50)]),
+        _configuration(qois, [PercentileFilter(80)])
+    ]
+    output_dir = str(tmp_path)
+    campaign = Campaign(configurations, n_workers=2, output_dir=output_dir)
+    summary = campaign()
+    assert list(summary["name"]) == ["run_0", "run_1"]
+    assert all(summary["n_evaluations"] == 2 * NROWS)
+    # the shared initial distribution is evaluated only once
+    assert summary["n_cached_evaluations"].sum() >= NROWS
+    assert len(calls) == 4 * NROWS - summary["n_cached_evaluations"].sum()
+    for name in campaign.names:
+        for i in range(2):
+            filename = "mobo_iteration_{}.csv".format(i)
+            assert os.path.exists(os.path.join(output_dir, name, filename))
+    assert os.path.exists(os.path.join(output_dir, "summary.csv"))
+    # the original configurations are left unchanged
+    assert configurations[0].output_dir is None
+
+
+def test_campaign_shared_clusterer(tmp_path):
+    qois = [QoIGroup(
+        ["qoi_x", "qoi_y"], lambda params: [params["x"], params["y"]], [0.0, 0.0]
+    )]
+    clusterer = DbscanClusterer()
+    configurations = [
+        _configuration(qois, [PercentileFilter(50)], clusterer),
+        _configuration(qois, [PercentileFilter(80)], clusterer)
+    ]
+    campaign = Campaign(configurations, n_workers=2, output_dir=str(tmp_path))
+    # each optimization fits its own copy of the clusterer
+    clusterers = [
+        c.local_configurations[0].clusterer
+        for c in campaign._prepare_configurations()
+    ]
+    assert clusterers[0] is not clusterers[1]
+    assert clusterer not in clusterers
+    summary = campaign()
+    assert all(summary["n_evaluations"] == 2 * NROWS)
+
+
+def test_campaign_process_workers(tmp_path):
+    qois = [QoIGroup(["qoi_x", "qoi_y"], _evaluate_xy, [0.0, 0.0])]
+    configurations = [
+        _configuration(qois, [PercentileFilter(50)]),
+        _configuration(qois, [PercentileFilter(80)])
+    ]
+    campaign = Campaign(
+        configurations, n_workers=2, output_dir=str(tmp_path), 
+        worker_type="process"
+    )
+    summary = campaign()
+    assert all(summary["n_evaluations"] == 2 * NROWS)
+    assert summary["n_cached_evaluations"].sum() >= NROWS
+
+
+def test_campaign_errors():
+    qois = [QoIGroup(["qoi_x", "qoi_y"], _evaluate_xy, [0.0, 0.0])]
+    configurations = [_configuration(qois, [])]
+    with pytest.raises(ValueError):
+        _ = Campaign([])
+    with pytest.raises(ValueError):
+        _ = Campaign(configurations, names=["run_0", "run_1"])
+    with pytest.raises(ValueError):
+        _ = Campaign(configurations, n_workers=0)
+    with pytest.raises(ValueError):
+        _ = Campaign(configurations, worker_type="fiber")
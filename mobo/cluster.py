@@ -1,12 +1,21 @@
 from abc import ABC
+from mobo.neighbors import NeighborGraph
 import numpy as np
+from sklearn.base import clone
 from sklearn.cluster import DBSCAN, KMeans
 from typing import Callable, Optional, Union
 
 
 class BaseClusterer(ABC):
-    """Abstract base class for Clusterers."""
-    def __call__(self, data: np.ndarray) -> np.ndarray:
+    """Abstract base class for Clusterers.
+
+    Notes:
+        - `neighbors` is an optional neighbor graph computed over `data` 
+          which may be used in place of computing distances from scratch.
+    """
+    def __call__(self, 
+                 data: np.ndarray, 
+                 neighbors: Optional[NeighborGraph] = None) -> np.ndarray:
         pass
 
 
@@ -33,9 +42,22 @@ class DbscanClusterer(BaseClusterer):
                                  leaf_size=leaf_size,
                                  p=p,
                                  n_jobs=None)
+        self._eps = eps
+        self._metric = metric
+        self._p = p
 
-    def __call__(self, data: np.ndarray) -> np.ndarray:
-        return self._clusterer.fit_predict(data)
+    def __call__(self, 
+                 data: np.ndarray, 
+                 neighbors: Optional[NeighborGraph] = None) -> np.ndarray:
+        euclidean = self._metric == "euclidean" or (
+            self._metric == "minkowski" and self._p in (None, 2)
+        )
+        if neighbors is None or not euclidean:
+            return self._clusterer.fit_predict(data)
+        clusterer = clone(self._clusterer).set_params(
+            metric="precomputed", metric_params=None, p=None
+        )
+        return clusterer.fit_predict(neighbors.radius_graph(self._eps))
 
 
 class KmeansClusterer(BaseClusterer):
@@ -68,5 +90,7 @@ class KmeansClusterer(BaseClusterer):
                                  algorithm=algorithm,
                                  n_jobs=None)
 
-    def __call__(self, data: np.ndarray) -> np.ndarray:
+    def __call__(self, 
+                 data: np.ndarray, 
+                 neighbors: Optional[NeighborGraph] = None) -> np.ndarray:
         return self._clusterer.fit_predict(data)
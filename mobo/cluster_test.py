@@ -1,4 +1,5 @@
 from mobo.cluster import DbscanClusterer, KmeansClusterer
+from mobo.neighbors import NeighborGraph
 import numpy as np
 
 NROWS = 1000
@@ -9,6 +10,8 @@ def test_dbscan_clusterer():
     dbscan = DbscanClusterer()
     cluster_ids = dbscan(DATA)
     assert cluster_ids.shape == (NROWS, )
+    shared_ids = dbscan(DATA, NeighborGraph(DATA))
+    assert np.array_equal(cluster_ids, shared_ids)
 
 
 def test_kmeans_clusterer():
@@ -1,11 +1,13 @@
+from mobo.allocation import BaseAllocator, UniformAllocator
 from mobo.cluster import BaseClusterer
 from mobo.error import BaseErrorCalculator
 from mobo.filter import BaseFilter
 from mobo.log import Logger
 from mobo.parameter import Parameter
 from mobo.projection import BaseProjector
-from mobo.qoi import QoI
-from typing import List, Optional
+from mobo.qoi import QoI, QoIGroup
+import numpy as np
+from typing import List, Optional, Union
 
 
 class LocalConfiguration(object):
@@ -17,18 +19,44 @@ class LocalConfiguration(object):
         error_calculator: Error calculation scheme.
         filters: Filters to apply.
         projector: Dimensionality reduction scheme.
+        prefilters: Filters to apply to the partial errors between qoi stages.
+        max_survivors: Maximum number of parameterizations to keep after 
+            filtration, by non-dominated front and then crowding distance.
+        cluster_space: Space to cluster in, either "projection" or "parameter".
+        allocator: Policy to split samples between clusters.
+        exclude_noise: Do not draw samples from noise points.
     """
     def __init__(self,
                  n_samples: int,
                  clusterer: BaseClusterer,
                  error_calculator: BaseErrorCalculator,
                  filters: List[BaseFilter],
-                 projector: BaseProjector) -> None:
+                 projector: BaseProjector,
+                 prefilters: Optional[List[BaseFilter]] = None,
+                 max_survivors: Optional[int] = None,
+                 cluster_space: str = "projection",
+                 allocator: Optional[BaseAllocator] = None,
+                 exclude_noise: bool = True) -> None:
         self.n_samples = n_samples
         self.clusterer = clusterer
         self.error_calculator = error_calculator
         self.filters = filters
         self.projector = projector
+        if prefilters is None:
+            prefilters = []
+        self.prefilters = prefilters
+        if max_survivors is not None and max_survivors < 1:
+            err = "`max_survivors` must be at least 1."
+            raise ValueError(err)
+        self.max_survivors = max_survivors
+        if cluster_space not in ("projection", "parameter"):
+            err = "`cluster_space` must be either 'projection' or 'parameter'."
+            raise ValueError(err)
+        self.cluster_space = cluster_space
+        if allocator is None:
+            allocator = UniformAllocator()
+        self.allocator = allocator
+        self.exclude_noise = exclude_noise
 
 
 class GlobalConfiguration(object):
@@ -38,20 +66,30 @@ class GlobalConfiguration(object):
         n_samples: Number of samples to start with.
         local_configurations: Configuration for each iteration.
         parameters: Parameter objects to fit.
-        qois: QoI objects to evaluate.
+        qois: QoI and QoIGroup objects to evaluate.
         initial_data_path: Path to a data file to start from.
         logger: Logging utility to monitor progress of the optimization.
+        dtype: Floating point type of the parameter, qoi, error and 
+            projection data.
+        output_dir: Directory to export iteration data to.
     """
     def __init__(self,
                  n_samples: int,
                  local_configurations: List[LocalConfiguration],
                  parameters: List[Parameter], 
-                 qois: List[QoI], 
+                 qois: List[Union[QoI, QoIGroup]], 
                  initial_data_path: Optional[str] = None,
-                 logger: Optional[Logger] = None) -> None:
+                 logger: Optional[Logger] = None,
+                 dtype: Union[str, type] = "float64",
+                 output_dir: Optional[str] = None) -> None:
         self.n_samples = n_samples
         self.local_configurations = local_configurations
         self.parameters = parameters
         self.qois = qois
         self.initial_data_path = initial_data_path
         self.logger = logger
+        if not np.issubdtype(np.dtype(dtype), np.floating):
+            err = "`dtype` must be a floating point type."
+            raise ValueError(err)
+        self.dtype = np.dtype(dtype)
+        self.output_dir = output_dir
@@ -10,6 +10,43 @@ class BaseFilter(ABC):
         pass
 
 
+class CrowdingDistanceFilter(BaseFilter):
+    """Non-dominated sorting and crowding distance truncation filter.
+
+    Notes:
+        - Rows are sorted into non-dominated fronts in error space and 
+          whole fronts are kept in rank order. Rows of the first front 
+          which does not fit are kept by the largest crowding distance, 
+          so the extremes of that front are kept first.
+
+    Args:
+        n_survivors: Maximum number of rows to keep.
+    """
+    def __init__(self, n_survivors: int) -> None:
+        if n_survivors < 1:
+            err = "`n_survivors` must be at least 1."
+            raise ValueError(err)
+        self._n_survivors = n_survivors
+
+    def __call__(self, data: np.ndarray) -> np.ndarray:
+        mask = np.zeros(data.shape[0], dtype=bool)
+        if data.shape[0] <= self._n_survivors:
+            mask[:] = True
+            return mask
+        remaining = np.arange(data.shape[0])
+        n_remaining = self._n_survivors
+        while n_remaining > 0:
+            front = remaining[_non_dominated(data[remaining])]
+            if len(front) > n_remaining:
+                distances = _crowding_distances(data[front])
+                order = np.argsort(-distances, kind="stable")
+                front = front[order[:n_remaining]]
+            mask[front] = True
+            n_remaining -= len(front)
+            remaining = remaining[~mask[remaining]]
+        return mask
+
+
 class ParetoFilter(BaseFilter):
     """Pareto optimality filter."""
     def __call__(self, data: np.ndarray) -> np.ndarray:
@@ -45,3 +82,27 @@ class ZscoreFilter(BaseFilter):
         scores = np.sum(normalized, axis=1) # sum each row
         z_values = zscore(scores)
         return np.array([z >= self._z for z in z_values])
+
+
+def _crowding_distances(data: np.ndarray) -> np.ndarray:
+    """Crowding distance of each row of a front."""
+    distances = np.zeros(data.shape[0])
+    for j in range(data.shape[1]):
+        order = np.argsort(data[:, j], kind="stable")
+        values = data[order, j]
+        distances[order[[0, -1]]] = np.inf
+        span = values[-1] - values[0]
+        if span > 0:
+            distances[order[1:-1]] += (values[2:] - values[:-2]) / span
+    return distances
+
+
+def _non_dominated(data: np.ndarray) -> np.ndarray:
+    """Mask of the rows which no other row dominates."""
+    mask = np.ones(data.shape[0], dtype=bool)
+    for i, err in enumerate(data):
+        if mask[i]:
+            # a row dominated by any row is dominated by a non-dominated row
+            dominated = np.all(err <= data, axis=1) & np.any(err < data, axis=1)
+            mask[dominated] = False
+    return mask
@@ -1,9 +1,24 @@
-from mobo.filter import ParetoFilter, PercentileFilter, ZscoreFilter
+from mobo.filter import CrowdingDistanceFilter, ParetoFilter
+from mobo.filter import PercentileFilter, ZscoreFilter
 import numpy as np
 
 DATA = np.random.normal(size=(1000, 3))
 
 
+def test_crowding_distance_filter():
+    crowding = CrowdingDistanceFilter(100)
+    mask = crowding(DATA)
+    filtered_data = DATA[mask]
+    assert filtered_data.shape[0] == 100
+    # the pareto front is kept ahead of dominated rows
+    pareto = ParetoFilter()(DATA)
+    assert np.count_nonzero(pareto) < 100
+    assert np.all(mask[pareto])
+    # the extremes of the last front are kept ahead of its interior
+    front = CrowdingDistanceFilter(np.count_nonzero(pareto) - 1)(DATA)
+    assert np.array_equal(np.min(DATA[front], axis=0), np.min(DATA, axis=0))
+    assert np.all(CrowdingDistanceFilter(2000)(DATA))
+
 def test_pareto_filter():
     pareto = ParetoFilter()
     mask = pareto(DATA)
@@ -0,0 +1,88 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.metrics import pairwise_distances
+from sklearn.neighbors import NearestNeighbors
+from typing import Dict, Optional, Tuple
+
+
+class NeighborGraph(object):
+    """Lazily computed euclidean neighbor structures over a dataset.
+
+    Notes:
+        - Each structure is computed at most once and shared between every
+          projector and clusterer which is given the graph.
+        - Neighbor queries are backed by a single tree index.
+
+    Args:
+        data: Data to compute neighbors over.
+        leaf_size: Leaf size of the tree index.
+    """
+    def __init__(self, data: np.ndarray, leaf_size: int = 30) -> None:
+        self.data = data
+        self._leaf_size = leaf_size
+        self._index: Optional[NearestNeighbors] = None
+        self._kneighbors: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._radius_graphs: Dict[float, csr_matrix] = {}
+        self._distances: Optional[np.ndarray] = None
+
+    @property
+    def n_samples(self) -> int:
+        return self.data.shape[0]
+
+    def kneighbors_graph(self, 
+                         n_neighbors: int, 
+                         include_self: bool = False) -> csr_matrix:
+        """Returns a sparse graph of distances to the nearest neighbors.
+
+        Args:
+            n_neighbors: Number of neighbors of each sample, excluding itself.
+            include_self: Store each sample as its own neighbor at distance 0.
+        """
+        n_neighbors = min(n_neighbors, self.n_samples - 1)
+        # a query for more neighbors satisfies every smaller query
+        if self._kneighbors is None or self._kneighbors[0].shape[1] < n_neighbors:
+            self._kneighbors = self._tree_index().kneighbors(
+                n_neighbors=n_neighbors
+            )
+        distances, indices = self._kneighbors
+        distances = distances[:, :n_neighbors]
+        indices = indices[:, :n_neighbors]
+        if include_self:
+            # explicit zeros are kept by the sparse matrix
+            distances = np.hstack([np.zeros((self.n_samples, 1)), distances])
+            indices = np.hstack([
+                np.arange(self.n_samples).reshape(-1, 1), indices
+            ])
+        width = distances.shape[1]
+        indptr = np.arange(0, self.n_samples * width + 1, width)
+        return csr_matrix(
+            (distances.ravel(), indices.ravel(), indptr),
+            shape=(self.n_samples, self.n_samples)
+        )
+
+    def radius_graph(self, radius: float) -> csr_matrix:
+        """Returns a sparse graph of distances to neighbors within a radius.
+
+        Args:
+            radius: Maximum distance between neighbors.
+        """
+        if radius not in self._radius_graphs:
+            self._radius_graphs[radius] = self._tree_index().radius_neighbors_graph(
+                radius=radius, mode="distance", sort_results=True
+            )
+        return self._radius_graphs[radius]
+
+    def distances(self) -> np.ndarray:
+        """Returns the dense matrix of pairwise distances."""
+        if self._distances is None:
+            self._distances = pairwise_distances(self.data, metric="euclidean")
+        return self._distances
+
+    def _tree_index(self) -> NearestNeighbors:
+        """Returns the tree index fit to the data."""
+        if self._index is None:
+            self._index = NearestNeighbors(
+                algorithm="auto", leaf_size=self._leaf_size, metric="euclidean"
+            )
+            self._index.fit(self.data)
+        return self._index
@@ -0,0 +1,33 @@
+from mobo.neighbors import NeighborGraph
+import numpy as np
+from sklearn.metrics import pairwise_distances
+
+NROWS = 100
+DATA = np.random.normal(size=(NROWS, 3))
+
+
+def test_neighbor_graph_kneighbors():
+    graph = NeighborGraph(DATA)
+    large = graph.kneighbors_graph(10)
+    small = graph.kneighbors_graph(5)
+    assert large.shape == small.shape == (NROWS, NROWS)
+    assert np.all(large.getnnz(axis=1) == 10)
+    assert np.all(small.getnnz(axis=1) == 5)
+    # the nearest neighbors are a subset of the larger query
+    assert np.all(large.multiply(small > 0).toarray() == small.toarray())
+    assert graph.kneighbors_graph(2 * NROWS).getnnz(axis=1)[0] == NROWS - 1
+    with_self = graph.kneighbors_graph(5, include_self=True)
+    assert np.all(with_self.getnnz(axis=1) == 6)
+    assert np.all(with_self.diagonal() == 0)
+
+
+def test_neighbor_graph_radius():
+    graph = NeighborGraph(DATA)
+    radius = graph.radius_graph(0.5)
+    assert radius is graph.radius_graph(0.5)
+    assert np.max(radius.data) <= 0.5
+
+
+def test_neighbor_graph_distances():
+    graph = NeighborGraph(DATA)
+    assert np.allclose(graph.distances(), pairwise_distances(DATA))
@@ -1,33 +1,53 @@
+from concurrent.futures import Executor, FIRST_COMPLETED, Future
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
+from mobo.cache import EvaluationCache, submit_evaluation
 from mobo.configuration import GlobalConfiguration
+from mobo.filter import CrowdingDistanceFilter
+from mobo.neighbors import NeighborGraph
+from mobo.qoi import QoI, QoIGroup
 import numpy as np
+import os
 import pandas as pd
 from scipy.stats import gaussian_kde
-from typing import List, Optional
+from sklearn.neighbors import NearestNeighbors
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 
 class Optimizer(object):
     """Optimization pipeline initialized from a configuration.
 
+    Notes:
+        - If an executor is provided the parameterizations of each stage are
+          evaluated concurrently on it. Only the qois are sent to the 
+          executor, so a process pool may be used when the qoi evaluators 
+          can be pickled (e.g. module level functions).
+
     Args:
         configuration: Configuration object to initialize from.
+        executor: Thread or process pool to evaluate parameterizations with.
+        cache: Store of evaluations shared with other optimizations.
     """
-    def __init__(self, configuration: GlobalConfiguration) -> None:
+    def __init__(self, 
+                 configuration: GlobalConfiguration,
+                 executor: Optional[Executor] = None,
+                 cache: Optional[EvaluationCache] = None) -> None:
         self.configuration = configuration
+        self.executor = executor
+        self.cache = cache
+        # number of qoi evaluations requested and served from the cache
+        self.n_evaluations = 0
+        self.n_cached_evaluations = 0
+        self._lock = Lock()
+        # number of models sampled from and the parameters drawn from each
+        self._generation = 0
+        self._drawn: Dict[int, np.ndarray] = {}
 
     def __call__(self) -> None:
         self._log("Beginning the optimization process...")
         # initialize the dataframe
-        path = self.configuration.initial_data_path
-        if path is None:
-            self._log("Generating initial parameter distributions...")
-            index = range(self.configuration.n_samples)
-            df = pd.DataFrame(columns=self.df_column_headers, index=index)
-            init_dist = self._generate_initial_parameter_distributions()
-            df[self.parameter_headers] = init_dist
-        else:
-            self._log("Reading initial parameter distributions from file...")
-            df = pd.read_csv(path)
+        df = self._initialize()
         # loop over each iteration
         last_df: Optional[pd.DataFrame] = None
         for i in range(len(self.configuration.local_configurations)):
@@ -40,17 +60,23 @@ class Optimizer(object):
                 df = self._sample(last_df, i) # returns a new df
             # evaluate the parameterizations
             df = self._evaluate(df, i)
+            # parameterizations skipped during evaluation are exported apart
+            skipped = df[df[self.skipped_header].eq(True)]
             # filter out poor parameterization
             df = pd.concat([df, last_df]) # rejoin the old dataframe
             df = self._filter(df, i)
             # reset index for proper joining
             df.reset_index(inplace=True, drop=True)
+            # share one neighbor graph between projection and clustering
+            neighbors = NeighborGraph(
+                df[self.parameter_headers].to_numpy(self.configuration.dtype)
+            )
             # project the filtered parameters onto a 2D space
-            df = self._project(df, i)
-            # cluster the projected parameter space
-            df = self._cluster(df, i)
+            df = self._project(df, i, neighbors)
+            # cluster the projected (or full) parameter space
+            df = self._cluster(df, i, neighbors)
             # write the iteration data to file
-            df = self._export(df, i)
+            df = self._export(df, i, skipped)
             # store for sampling
             last_df = df
             iteration_end = datetime.now()
@@ -67,7 +93,7 @@ class Optimizer(object):
 
     @property
     def qoi_headers(self) -> List[str]:
-        return [q.name for q in self.configuration.qois]
+        return [name for q in self.configuration.qois for name in q.names]
 
     @property
     def error_headers(self) -> List[str]:
@@ -81,28 +107,73 @@ class Optimizer(object):
     def cluster_header(self) -> str:
         return "cluster_id"
 
+    @property
+    def skipped_header(self) -> str:
+        return "skipped"
+
+    @property
+    def generation_header(self) -> str:
+        return "generation"
+
+    @property
+    def origin_header(self) -> str:
+        return "origin_cluster_id"
+
+    @property
+    def float_headers(self) -> List[str]:
+        return list(
+            self.parameter_headers + self.qoi_headers + self.error_headers +
+            self.projection_headers
+        )
+
     @property
     def df_column_headers(self) -> List[str]:
         return list(
             self.parameter_headers + self.qoi_headers + self.error_headers +
-            self.projection_headers + [self.cluster_header]
+            self.projection_headers + [
+                self.cluster_header, self.skipped_header, 
+                self.generation_header, self.origin_header
+            ]
         )
 
-    def _sample(self, df: pd.DataFrame, iteration: int) -> pd.DataFrame:
+    def _initialize(self) -> pd.DataFrame:
+        """Generate or read the initial parameter distributions."""
+        path = self.configuration.initial_data_path
+        if path is None:
+            self._log("Generating initial parameter distributions...")
+            df = self._empty_dataframe(self.configuration.n_samples)
+            init_dist = self._generate_initial_parameter_distributions()
+            df[self.parameter_headers] = init_dist
+        else:
+            self._log("Reading initial parameter distributions from file...")
+            df = pd.read_csv(path)
+            # columns which are not in the file are missing values
+            for h in self.df_column_headers:
+                if h not in df.columns:
+                    df[h] = np.nan
+            df = df.astype({
+                h: self.configuration.dtype 
+                for h in self.float_headers if h in df.columns
+            })
+        return df
+
+    def _sample(self, 
+                df: pd.DataFrame, 
+                iteration: int, 
+                n_samples: Optional[int] = None) -> pd.DataFrame:
         """Resample the filtered distribution."""
         self._log("Resampling parameter space via KDE...")
-        cluster_ids = set(df[self.cluster_header].to_numpy())
-        n_samples = self.configuration.local_configurations[iteration].n_samples
-        n_samples_per_cluster = n_samples // len(cluster_ids)
-        self._log(
-            "\tDrawing {} samples per cluster...".format(n_samples_per_cluster)
-        )
-        samples = []
+        local_config = self.configuration.local_configurations[iteration]
+        if n_samples is None:
+            n_samples = local_config.n_samples
+        cluster_ids = sorted(set(df[self.cluster_header].to_numpy()))
+        kdes = {}
         for cluster_id in cluster_ids:
             self._log("\tCluster {}:".format(cluster_id))
             data = df[df[self.cluster_header] == cluster_id]
             self._log("\t\tsamples: {}".format(len(data)))
-            data_arr = data[self.parameter_headers].to_numpy(float)
+            # the kde covariance is computed in double precision
+            data_arr = data[self.parameter_headers].to_numpy(np.float64)
             # linalg error when num samples is less than num parameters
             try:
                 kde = gaussian_kde(data_arr.T)
@@ -116,84 +187,281 @@ class Optimizer(object):
                 continue
             else:
                 self._log("\t\tbandwidth: {:.6}".format(bandwidth))
-                samples.append(kde.resample(n_samples_per_cluster).T)
-        samples_arr = np.vstack(samples)
-        index = range(len(samples_arr))
-        new_df = pd.DataFrame(columns=self.df_column_headers, index=index)
+                kdes[cluster_id] = kde
+        # dbscan labels noise points as -1
+        if local_config.exclude_noise and -1 in kdes:
+            if len(kdes) > 1:
+                del kdes[-1]
+                self._log("\tExcluded noise points from resampling.")
+            else:
+                self._log("\tOnly noise points can be resampled.")
+        # split the whole budget between the clusters which can be sampled
+        cluster_ids = list(kdes)
+        sizes, survivors, draws = self._cluster_statistics(df, cluster_ids)
+        allocation = local_config.allocator(n_samples, sizes, survivors, draws)
+        samples = []
+        origins = []
+        for cluster_id, n in zip(cluster_ids, allocation):
+            self._log(
+                "\tDrawing {} samples from cluster {}...".format(n, cluster_id)
+            )
+            samples.append(kdes[cluster_id].resample(n).T)
+            origins.append(np.full(n, cluster_id))
+        samples_arr = np.vstack(samples).astype(self.configuration.dtype)
+        # steady-state optimization draws from one model more than once
+        drawn = [samples_arr]
+        if self._generation in self._drawn:
+            drawn.insert(0, self._drawn[self._generation])
+        self._drawn[self._generation] = np.vstack(drawn)
+        new_df = self._empty_dataframe(len(samples_arr))
         new_df[self.parameter_headers] = samples_arr
+        new_df[self.generation_header] = self._generation
+        new_df[self.origin_header] = np.concatenate(origins)
         return new_df
 
+    def _cluster_statistics(self, 
+                            df: pd.DataFrame, 
+                            cluster_ids: List[int]
+                            ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Count the members, survivors and draws of each cluster."""
+        clusters = df[self.cluster_header].to_numpy()
+        sizes = np.array([np.count_nonzero(clusters == c) for c in cluster_ids])
+        survivors = np.zeros(len(cluster_ids))
+        draws = np.zeros(len(cluster_ids))
+        previous = self._generation - 1
+        drawn = self._drawn.get(previous)
+        members = np.isin(clusters, cluster_ids)
+        if drawn is None or not members.any():
+            return sizes, survivors, draws
+        # survivors drawn from the previous model
+        fresh = (df[self.generation_header] == previous).to_numpy(bool)
+        # every draw is attributed to the cluster of its nearest member
+        data = df[self.parameter_headers].to_numpy(np.float64)[members]
+        index = NearestNeighbors(n_neighbors=1).fit(data)
+        nearest = index.kneighbors(
+            drawn.astype(np.float64), return_distance=False
+        ).ravel()
+        nearest_clusters = clusters[members][nearest]
+        for k, cluster_id in enumerate(cluster_ids):
+            survivors[k] = np.count_nonzero(fresh & (clusters == cluster_id))
+            draws[k] = np.count_nonzero(nearest_clusters == cluster_id)
+        return sizes, survivors, draws
+
     def _evaluate(self, df: pd.DataFrame, iteration: int) -> pd.DataFrame:
         """Evaluate each qoi for each parameterization."""
         self._log("Evaluating parameterizations...")
+        df = self._evaluate_stages(df, iteration, self.executor)
+        n_skipped = np.count_nonzero(df[self.skipped_header].to_numpy(bool))
+        self._log("\tSamples skipped: {}".format(n_skipped))
+        return df
+
+    def _evaluate_stages(self, 
+                         df: pd.DataFrame, 
+                         iteration: int, 
+                         executor: Optional[Executor] = None,
+                         reference: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Evaluate each qoi for each parameterization stage by stage."""
         err_calc = self.configuration.local_configurations[iteration].error_calculator
-        qoi_targets = np.array([
-            qoi.target for qoi in self.configuration.qois
-        ])
-        all_qoi_values: List[np.ndarray] = []
-        all_error_values: List[np.ndarray] = []
-        for _, parameterization in df[self.parameter_headers].iterrows():
-            qoi_values = np.array([
-                qoi.evaluator(parameterization.to_dict()) 
-                for qoi in self.configuration.qois
-            ])
-            all_qoi_values.append(qoi_values)
-            error_values = err_calc(actual=qoi_values, target=qoi_targets)
-            all_error_values.append(error_values)
-        qoi_arr = np.array(all_qoi_values)
-        error_arr = np.array(all_error_values)
+        qois = self.configuration.qois
+        qoi_targets = np.array([t for qoi in qois for t in qoi.targets])
+        # column indices of the values produced by each qoi (or group)
+        qoi_columns: List[List[int]] = []
+        for qoi in qois:
+            start = sum(len(c) for c in qoi_columns)
+            qoi_columns.append(list(range(start, start + len(qoi.names))))
+        parameterizations = [
+            parameterization.to_dict()
+            for _, parameterization in df[self.parameter_headers].iterrows()
+        ]
+        shape = (len(df), len(qoi_targets))
+        qoi_arr = np.full(shape, np.nan, dtype=self.configuration.dtype)
+        error_arr = np.full(shape, np.nan, dtype=self.configuration.dtype)
+        active = np.ones(len(df), dtype=bool)
+        evaluated = np.zeros(len(qoi_targets), dtype=bool)
+        for stage in sorted(set(qoi.stage for qoi in qois)):
+            # discard poor parameterizations before the next stage
+            if np.any(evaluated):
+                active = self._prefilter(
+                    error_arr, active, evaluated, iteration, reference
+                )
+            stage_qois = [j for j, qoi in enumerate(qois) if qoi.stage == stage]
+            columns = [i for j in stage_qois for i in qoi_columns[j]]
+            rows = np.flatnonzero(active)
+            # submit every evaluation of the stage before waiting on any
+            futures = [
+                [
+                    self._submit(qois[j], parameterizations[row], executor)
+                    for j in stage_qois
+                ]
+                for row in rows
+            ]
+            for row, row_futures in zip(rows, futures):
+                qoi_values = np.concatenate([f.result() for f, _ in row_futures])
+                with self._lock:
+                    self.n_evaluations += len(stage_qois)
+                    self.n_cached_evaluations += sum(c for _, c in row_futures)
+                qoi_arr[row, columns] = qoi_values
+                error_arr[row, columns] = err_calc(
+                    actual=qoi_values, target=qoi_targets[columns]
+                )
+            evaluated[columns] = True
         df.update(
             {qh: qoi_arr[:, i] for i, qh in enumerate(self.qoi_headers)}
         )
         df.update(
             {eh: error_arr[:, i] for i, eh in enumerate(self.error_headers)}
         )
+        df[self.skipped_header] = ~active
         return df
 
-    def _filter(self, df: pd.DataFrame, iteration: int) -> pd.DataFrame:
-        """Filter out poor parameterizations."""
+    def _submit(self, 
+                qoi: Union[QoI, QoIGroup], 
+                parameterization: dict,
+                executor: Optional[Executor] = None) -> Tuple[Future, bool]:
+        """Submit a qoi evaluation and flag whether it is served from cache."""
+        if self.cache is None:
+            return submit_evaluation(qoi, parameterization, executor), False
+        return self.cache.submit(qoi, parameterization, executor)
+
+    def _prefilter(self, 
+                   error_arr: np.ndarray, 
+                   active: np.ndarray, 
+                   evaluated: np.ndarray, 
+                   iteration: int,
+                   reference: Optional[np.ndarray] = None) -> np.ndarray:
+        """Filter out poor parameterizations using partial errors.
+
+        Args:
+            reference: Errors of parameterizations to rank against which
+                are never filtered out themselves.
+        """
+        prefilters = self.configuration.local_configurations[iteration].prefilters
+        active = active.copy()
+        for f in prefilters:
+            rows = np.flatnonzero(active)
+            if len(rows) == 0:
+                break
+            columns = np.flatnonzero(evaluated)
+            errors = error_arr[np.ix_(rows, columns)]
+            if reference is not None:
+                errors = np.vstack([errors, reference[:, columns]])
+            mask = f(errors)[:len(rows)]
+            active[rows[~mask]] = False
+        return active
+
+    def _filter(self, 
+                df: pd.DataFrame, 
+                iteration: int,
+                reference: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Filter out poor parameterizations.
+
+        Args:
+            reference: Errors of parameterizations to rank against which
+                are never filtered out themselves.
+        """
         self._log("Filtering parameterizations...")
         self._log("\tSamples before filtration: {}".format(len(df)))
-        filters = self.configuration.local_configurations[iteration].filters
-        for f in filters:
-            mask = f(df[self.error_headers].to_numpy())
+        # parameterizations skipped during evaluation have incomplete errors
+        df = df[~df[self.skipped_header].eq(True)]
+        self._log("\tSamples after skipping: {}".format(len(df)))
+        local_config = self.configuration.local_configurations[iteration]
+        for f in local_config.filters:
+            errors = df[self.error_headers].to_numpy(self.configuration.dtype)
+            if reference is not None:
+                errors = np.vstack([errors, reference])
+            mask = f(errors)[:len(df)]
             df = df[mask]
         self._log("\tSamples after filtration: {}".format(len(df)))
+        return self._truncate(df, iteration)
+
+    def _truncate(self, df: pd.DataFrame, iteration: int) -> pd.DataFrame:
+        """Bound the number of survivors."""
+        max_survivors = self.configuration.local_configurations[iteration].max_survivors
+        # bound the survivors by front rank then diversity within the front
+        if max_survivors is not None and len(df) > max_survivors:
+            crowding = CrowdingDistanceFilter(max_survivors)
+            errors = df[self.error_headers].to_numpy(self.configuration.dtype)
+            df = df[crowding(errors)]
+            self._log("\tSamples after truncation: {}".format(len(df)))
         return df
 
-    def _project(self, df: pd.DataFrame, iteration: int) -> pd.DataFrame:
+    def _project(self, 
+                 df: pd.DataFrame, 
+                 iteration: int, 
+                 neighbors: Optional[NeighborGraph] = None) -> pd.DataFrame:
         """Project parameter space down to a 2D space."""
         self._log("Projecting parameter space down to 2D...")
         proj = self.configuration.local_configurations[iteration].projector
-        proj_arr = proj(df[self.parameter_headers].to_numpy())
+        data = df[self.parameter_headers].to_numpy(self.configuration.dtype)
+        proj_arr = proj(data, neighbors).astype(self.configuration.dtype)
         df.update(
             {pn: proj_arr[:, i] for i, pn in enumerate(self.projection_headers)}
         )
         return df
 
-    def _cluster(self, df: pd.DataFrame, iteration: int) -> pd.DataFrame:
-        """Assign cluster ids to projected parameters."""
-        self._log("Clustering projected parameter space...")
-        clust = self.configuration.local_configurations[iteration].clusterer
-        cluster_ids = clust(df[self.projection_headers].to_numpy())
+    def _cluster(self, 
+                 df: pd.DataFrame, 
+                 iteration: int, 
+                 neighbors: Optional[NeighborGraph] = None) -> pd.DataFrame:
+        """Assign cluster ids to projected (or full) parameters."""
+        local_config = self.configuration.local_configurations[iteration]
+        clust = local_config.clusterer
+        if local_config.cluster_space == "parameter":
+            self._log("Clustering parameter space...")
+            data = df[self.parameter_headers].to_numpy(self.configuration.dtype)
+        else:
+            # the neighbor graph is computed over the parameter space
+            self._log("Clustering projected parameter space...")
+            data = df[self.projection_headers].to_numpy(self.configuration.dtype)
+            neighbors = None
+        cluster_ids = clust(data, neighbors)
         df.update(
             {self.cluster_header: cluster_ids}
         )
+        # each clustering is a new model to sample from
+        self._generation += 1
+        self._drawn = {
+            k: v for k, v in self._drawn.items() if k >= self._generation - 1
+        }
         return df
 
-    def _export(self, df: pd.DataFrame, iteration: int) -> pd.DataFrame:
+    def _export(self, 
+                df: pd.DataFrame, 
+                iteration: int, 
+                skipped: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """Export the results of an iteration as a csv file."""
-        filename = "mobo_iteration_{}.csv".format(iteration)
+        filename = self._export_path("mobo_iteration_{}.csv".format(iteration))
         df.to_csv(filename)
         self._log("Exported iteration data to {}.".format(filename))
+        # skipped parameterizations have partial qois and missing errors
+        if skipped is not None and len(skipped) > 0:
+            filename = self._export_path(
+                "mobo_iteration_{}_skipped.csv".format(iteration)
+            )
+            skipped.to_csv(filename)
+            self._log("Exported skipped parameterizations to {}.".format(filename))
         return df
 
+    def _export_path(self, filename: str) -> str:
+        """Locate an exported file within the output directory."""
+        output_dir = self.configuration.output_dir
+        if output_dir is None:
+            return filename
+        os.makedirs(output_dir, exist_ok=True)
+        return os.path.join(output_dir, filename)
+
     def _generate_initial_parameter_distributions(self) -> np.ndarray:
         """Generate a uniform distribution over the parameter bounds."""
         lows = np.array([p.lower_bound for p in self.configuration.parameters])
         highs = np.array([p.upper_bound for p in self.configuration.parameters])
         size = (self.configuration.n_samples, lows.shape[0])
-        return np.random.uniform(low=lows, high=highs, size=size)
+        arr = np.random.uniform(low=lows, high=highs, size=size)
+        return arr.astype(self.configuration.dtype)
+
+    def _empty_dataframe(self, n_rows: int) -> pd.DataFrame:
+        """Construct a dataframe of missing values with typed columns."""
+        df = pd.DataFrame(columns=self.df_column_headers, index=range(n_rows))
+        return df.astype({h: self.configuration.dtype for h in self.float_headers})
 
     def _log(self, msg: str) -> None:
         """Log a message to file or stdout."""
@@ -202,3 +470,193 @@ class Optimizer(object):
             print(msg)
         else:
             logger.log(msg)
+
+
+class SteadyStateOptimizer(Optimizer):
+    """Asynchronous optimization pipeline initialized from a configuration.
+
+    Notes:
+        - A fixed number of evaluations is kept in flight. Completed 
+          evaluations are merged in batches rather than at the end of each
+          generation.
+        - Every `refit_interval` batches the new evaluations are filtered 
+          against the errors of the latest model and merged into it. The 
+          merged model is projected and clustered on a background thread 
+          while evaluations stay in flight, and new candidates are drawn 
+          from it once it is ready.
+        - Each local configuration is run until `n_samples` evaluations 
+          have completed (the first runs the whole initial distribution). 
+          The survivors of the last iteration and every evaluation of the 
+          iteration are then filtered as a whole and exported, so the 
+          survivors do not depend on `batch_size`.
+        - Prefilters rank the partial errors of each task against the 
+          errors of the latest model. Until the first model is fit, each 
+          task is only ranked against itself.
+        - Each task runs on one of `n_workers` threads. Its evaluations are
+          run on the executor if one is provided (which may be a process 
+          pool) and otherwise on the task's thread.
+
+    Args:
+        configuration: Configuration object to initialize from.
+        n_workers: Number of evaluation tasks kept in flight.
+        chunk_size: Number of parameterizations evaluated by each task.
+        batch_size: Number of completed evaluations merged at a time.
+        refit_interval: Number of merged batches between model refits.
+        executor: Thread or process pool to evaluate parameterizations with.
+        cache: Store of evaluations shared with other optimizations.
+    """
+    def __init__(self, 
+                 configuration: GlobalConfiguration,
+                 n_workers: int = 4,
+                 chunk_size: int = 1,
+                 batch_size: int = 100,
+                 refit_interval: int = 10,
+                 executor: Optional[Executor] = None,
+                 cache: Optional[EvaluationCache] = None) -> None:
+        super().__init__(configuration, executor, cache)
+        if min(n_workers, chunk_size, batch_size, refit_interval) < 1:
+            err = (
+                "`n_workers`, `chunk_size`, `batch_size` and `refit_interval` "
+                "must be at least 1."
+            )
+            raise ValueError(err)
+        self.n_workers = n_workers
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.refit_interval = refit_interval
+
+    def __call__(self) -> None:
+        self._log("Beginning the steady-state optimization process...")
+        candidates = self._initialize()
+        # survivors of the last iteration and the latest model
+        survivors: Optional[pd.DataFrame] = None
+        model: Optional[pd.DataFrame] = None
+        reference: Optional[np.ndarray] = None
+        # tasks are coordinated on threads and evaluated on the executor
+        tasks = ThreadPoolExecutor(max_workers=self.n_workers)
+        # models are refit in the background while tasks are in flight
+        refitter = ThreadPoolExecutor(max_workers=1)
+        refit: Optional[Future] = None
+        in_flight: Set[Future] = set()
+        try:
+            for i, local_config in enumerate(self.configuration.local_configurations):
+                iteration_start = datetime.now()
+                self._log("\nBeginning iteration {}...".format(i))
+                # the first iteration evaluates the initial distribution
+                if i == 0:
+                    n_samples = len(candidates)
+                else:
+                    n_samples = local_config.n_samples
+                    candidates = self._empty_dataframe(0)
+                n_submitted = 0
+                n_completed = 0
+                n_pending = 0
+                n_batches = 0
+                # every evaluation of the iteration and those not yet merged
+                completed: List[pd.DataFrame] = []
+                unmerged: List[pd.DataFrame] = []
+                while n_completed < n_samples:
+                    if refit is not None and refit.done():
+                        model = refit.result()
+                        refit = None
+                        reference = self._reference(model)
+                        # the initial distribution is always evaluated
+                        if i > 0:
+                            candidates = self._empty_dataframe(0)
+                    # keep the workers saturated
+                    while (len(in_flight) < self.n_workers 
+                            and n_submitted < n_samples):
+                        if len(candidates) == 0 and model is not None:
+                            # a model is never drawn from while being refit
+                            if refit is not None:
+                                model = refit.result()
+                                refit = None
+                                reference = self._reference(model)
+                            candidates = self._draw(model, i)
+                        size = min(self.chunk_size, n_samples - n_submitted)
+                        chunk = candidates.iloc[:size].reset_index(drop=True)
+                        candidates = candidates.iloc[size:]
+                        if len(chunk) == 0:
+                            break
+                        in_flight.add(tasks.submit(
+                            self._evaluate_stages, chunk, i, self.executor, 
+                            reference
+                        ))
+                        n_submitted += len(chunk)
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        completed.append(future.result())
+                        unmerged.append(completed[-1])
+                        n_completed += len(completed[-1])
+                        n_pending += len(completed[-1])
+                    if n_pending < self.batch_size:
+                        continue
+                    n_pending = 0
+                    n_batches += 1
+                    # merge the batches into a new model in the background
+                    if (n_batches % self.refit_interval == 0 
+                            and n_completed < n_samples 
+                            and refit is None):
+                        refit = refitter.submit(self._update, model, unmerged, i)
+                        unmerged = []
+                # the refit is superseded by the refit of the whole iteration
+                if refit is not None:
+                    refit.result()
+                    refit = None
+                df = pd.concat([survivors] + completed)
+                model = self._refit(self._filter(df, i), i)
+                reference = self._reference(model)
+                # write the iteration data to file
+                skipped = df[df[self.skipped_header].eq(True)]
+                model = self._export(model, i, skipped)
+                survivors = model
+                iteration_end = datetime.now()
+                time_delta = round(
+                    (iteration_end - iteration_start).total_seconds(), 3
+                )
+                self._log(
+                    "Completed iteration {} in {} seconds.\n".format(i, time_delta)
+                )
+        finally:
+            # evaluations still in flight after the last iteration are discarded
+            for future in in_flight:
+                future.cancel()
+            tasks.shutdown(wait=True)
+            refitter.shutdown(wait=True)
+
+    def _draw(self, model: pd.DataFrame, iteration: int) -> pd.DataFrame:
+        """Draw enough candidates from the model to last until its refit."""
+        n_samples = max(
+            self.batch_size * self.refit_interval,
+            model[self.cluster_header].nunique()
+        )
+        return self._sample(model, iteration, n_samples)
+
+    def _update(self, 
+                model: Optional[pd.DataFrame], 
+                frames: List[pd.DataFrame], 
+                iteration: int) -> pd.DataFrame:
+        """Merge new evaluations into the model and refit it."""
+        df = pd.concat(frames)
+        # only the new evaluations are ranked against the model
+        df = self._filter(df, iteration, self._reference(model))
+        df = self._truncate(pd.concat([model, df]), iteration)
+        return self._refit(df, iteration)
+
+    def _refit(self, df: pd.DataFrame, iteration: int) -> pd.DataFrame:
+        """Project and cluster the survivors to sample from."""
+        # reset index for proper joining
+        df = df.reset_index(drop=True)
+        # share one neighbor graph between projection and clustering
+        neighbors = NeighborGraph(
+            df[self.parameter_headers].to_numpy(self.configuration.dtype)
+        )
+        df = self._project(df, iteration, neighbors)
+        df = self._cluster(df, iteration, neighbors)
+        return df
+
+    def _reference(self, model: Optional[pd.DataFrame]) -> Optional[np.ndarray]:
+        """Errors of the model to rank new evaluations against."""
+        if model is None:
+            return None
+        return model[self.error_headers].to_numpy(self.configuration.dtype)
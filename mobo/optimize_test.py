@@ -0,0 +1,319 @@
+from concurrent.futures import ProcessPoolExecutor
+from mobo.cluster import DbscanClusterer
+from mobo.configuration import GlobalConfiguration, LocalConfiguration
+from mobo.error import AbsoluteErrorCalculator
+from mobo.filter import ParetoFilter, PercentileFilter
+from mobo.log import Logger
+from mobo.optimize import Optimizer, SteadyStateOptimizer
+from mobo.parameter import Parameter
+from mobo.projection import PCAProjector
+from mobo.qoi import QoI, QoIGroup
+import numpy as np
+import pandas as pd
+import pytest
+import threading
+
+NROWS = 100
+PARAMETERS = [Parameter("x", -1.0, 1.0), Parameter("y", -1.0, 1.0)]
+
+
+def _evaluate_xy(params):
+    return [params["x"], params["y"]]
+
+
+def _optimizer(qois, prefilters=None, dtype="float64", filters=None):
+    local_configuration = LocalConfiguration(
+        n_samples=NROWS,
+        clusterer=DbscanClusterer(),
+        error_calculator=AbsoluteErrorCalculator(),
+        filters=filters or [],
+        projector=PCAProjector(),
+        prefilters=prefilters
+    )
+    global_configuration = GlobalConfiguration(
+        n_samples=NROWS,
+        local_configurations=[local_configuration],
+        parameters=PARAMETERS,
+        qois=qois,
+        logger=Logger(),
+        dtype=dtype
+    )
+    return Optimizer(global_configuration)
+
+
+def _dataframe(optimizer):
+    df = optimizer._empty_dataframe(NROWS)
+    df[optimizer.parameter_headers] = np.random.uniform(
+        -1.0, 1.0, size=(NROWS, len(PARAMETERS))
+    ).astype(optimizer.configuration.dtype)
+    return df
+
+
+def test_optimizer_staged_evaluation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    def expensive(params):
+        calls.append(params)
+        return params["y"]
+    qois = [
+        QoI("cheap", lambda params: params["x"], 0.0),
+        QoI("expensive", expensive, 0.0, stage=1)
+    ]
+    optimizer = _optimizer(qois, prefilters=[PercentileFilter(50)])
+    df = optimizer._evaluate(_dataframe(optimizer), 0)
+    skipped = df[optimizer.skipped_header].to_numpy(bool)
+    assert len(calls) == NROWS - np.count_nonzero(skipped)
+    assert 0 < len(calls) < NROWS
+    assert df["expensive"][skipped].isna().all()
+    assert not df["cheap"].isna().any()
+    df = optimizer._filter(df, 0)
+    assert len(df) == len(calls)
+
+
+def test_optimizer_unstaged_evaluation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    qois = [
+        QoI("qoi_x", lambda params: params["x"], 0.0),
+        QoI("qoi_y", lambda params: params["y"], 0.0)
+    ]
+    optimizer = _optimizer(qois, prefilters=[PercentileFilter(50)])
+    df = optimizer._evaluate(_dataframe(optimizer), 0)
+    assert not df[optimizer.skipped_header].to_numpy(bool).any()
+    assert not df[optimizer.error_headers].isna().any().any()
+
+
+def test_optimizer_grouped_evaluation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    def evaluator(params):
+        calls.append(params)
+        return {"qoi_x": params["x"], "qoi_y": params["y"]}
+    qois = [
+        QoIGroup(["qoi_x", "qoi_y"], evaluator, [0.0, 1.0]),
+        QoI("qoi_sum", lambda params: params["x"] + params["y"], 0.0)
+    ]
+    optimizer = _optimizer(qois)
+    assert optimizer.qoi_headers == ["qoi_x", "qoi_y", "qoi_sum"]
+    df = optimizer._evaluate(_dataframe(optimizer), 0)
+    assert len(calls) == NROWS
+    errors = df[optimizer.error_headers].to_numpy(float)
+    expected = np.absolute(df[["x", "y"]].to_numpy(float) - [0.0, 1.0])
+    assert np.allclose(errors[:, :2], expected)
+
+
+def test_optimizer_max_survivors(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    qois = [
+        QoI("qoi_x", lambda params: params["x"], 0.0),
+        QoI("qoi_y", lambda params: params["y"], 0.0)
+    ]
+    optimizer = _optimizer(qois)
+    optimizer.configuration.local_configurations[0].max_survivors = 10
+    df = optimizer._evaluate(_dataframe(optimizer), 0)
+    pareto = ParetoFilter()(df[optimizer.error_headers].to_numpy())
+    filtered_df = optimizer._filter(df, 0)
+    assert len(filtered_df) == 10
+    # non-dominated parameterizations are kept ahead of dominated ones
+    assert set(df.index[pareto]) <= set(filtered_df.index)
+    with pytest.raises(ValueError):
+        _ = LocalConfiguration(
+            n_samples=NROWS,
+            clusterer=DbscanClusterer(),
+            error_calculator=AbsoluteErrorCalculator(),
+            filters=[],
+            projector=PCAProjector(),
+            max_survivors=0
+        )
+
+
+def test_optimizer_dtype(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    qois = [
+        QoI("qoi_x", lambda params: params["x"], 0.0),
+        QoI("qoi_y", lambda params: params["y"], 0.0)
+    ]
+    optimizer = _optimizer(qois, dtype="float32")
+    df = optimizer._evaluate(_dataframe(optimizer), 0)
+    df = optimizer._filter(df, 0)
+    df.reset_index(inplace=True, drop=True)
+    df = optimizer._project(df, 0)
+    df = optimizer._cluster(df, 0)
+    for header in optimizer.float_headers:
+        assert df[header].dtype == np.float32
+    with pytest.raises(ValueError):
+        _ = _optimizer(qois, dtype="int32")
+
+
+def test_optimizer_process_pool(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    qois = [QoIGroup(["qoi_x", "qoi_y"], _evaluate_xy, [0.0, 0.0])]
+    optimizer = _optimizer(qois)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        optimizer.executor = executor
+        df = optimizer._evaluate(_dataframe(optimizer), 0)
+    assert np.array_equal(
+        df[optimizer.qoi_headers].to_numpy(), 
+        df[optimizer.parameter_headers].to_numpy()
+    )
+    assert optimizer.n_evaluations == NROWS
+
+
+def test_steady_state_optimizer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    def evaluator(params):
+        calls.append(params)
+        return [params["x"], params["y"]]
+    qois = [QoIGroup(["qoi_x", "qoi_y"], evaluator, [0.0, 0.0])]
+    optimizer = _optimizer(qois)
+    local_configurations = optimizer.configuration.local_configurations
+    local_configurations.append(local_configurations[0])
+    optimizer = SteadyStateOptimizer(
+        optimizer.configuration, n_workers=4, batch_size=20, refit_interval=2
+    )
+    optimizer()
+    # the initial distribution and one iteration of resampling
+    assert len(calls) == 2 * NROWS
+    for i in range(len(local_configurations)):
+        df = pd.read_csv("mobo_iteration_{}.csv".format(i))
+        assert not df[optimizer.cluster_header].isna().any()
+
+
+@pytest.mark.parametrize("batch_size", [10, 50])
+def test_steady_state_optimizer_filters(tmp_path, monkeypatch, batch_size):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    def evaluator(params):
+        calls.append((params["x"], params["y"]))
+        return [params["x"], params["y"]]
+    qois = [QoIGroup(["qoi_x", "qoi_y"], evaluator, [0.0, 0.0])]
+    optimizer = _optimizer(qois, filters=[PercentileFilter(50)])
+    initial_df = _dataframe(optimizer)
+    initial_df.to_csv("initial_data.csv", index=False)
+    optimizer.configuration.initial_data_path = "initial_data.csv"
+    optimizer = SteadyStateOptimizer(
+        optimizer.configuration, batch_size=batch_size, refit_interval=1
+    )
+    optimizer()
+    # every initial parameterization is evaluated despite refitting
+    initial_params = optimizer._initialize()[optimizer.parameter_headers]
+    assert sorted(calls) == sorted(map(tuple, initial_params.to_numpy()))
+    # the filters are independent of the batch size
+    df = pd.read_csv("mobo_iteration_0.csv")
+    assert len(df) == NROWS // 2
+
+
+def test_steady_state_optimizer_refit(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    qois = [QoIGroup(["qoi_x", "qoi_y"], _evaluate_xy, [0.0, 0.0])]
+    optimizer = _optimizer(qois, filters=[PercentileFilter(50)])
+    local_configurations = optimizer.configuration.local_configurations
+    local_configurations.append(local_configurations[0])
+    optimizer = SteadyStateOptimizer(
+        optimizer.configuration, batch_size=10, refit_interval=1
+    )
+    updates = []
+    update = optimizer._update
+    def _update(model, frames, iteration):
+        updates.append((threading.current_thread(), sum(map(len, frames))))
+        return update(model, frames, iteration)
+    monkeypatch.setattr(optimizer, "_update", _update)
+    optimizer()
+    # models are refit in the background from the new evaluations only
+    assert len(updates) > 0
+    assert all(t is not threading.main_thread() for t, _ in updates)
+    assert all(n < NROWS for _, n in updates)
+    df = pd.read_csv("mobo_iteration_1.csv")
+    assert not df[optimizer.cluster_header].isna().any()
+
+
+def test_steady_state_optimizer_prefilters(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    def expensive(params):
+        calls.append(params)
+        return params["y"]
+    qois = [
+        QoI("cheap", lambda params: params["x"], 0.0),
+        QoI("expensive", expensive, 0.0, stage=1)
+    ]
+    optimizer = _optimizer(qois, prefilters=[PercentileFilter(50)])
+    local_configurations = optimizer.configuration.local_configurations
+    local_configurations.append(local_configurations[0])
+    optimizer = SteadyStateOptimizer(
+        optimizer.configuration, batch_size=20, refit_interval=1
+    )
+    optimizer()
+    # tasks of one parameterization are ranked against the latest model
+    assert 0 < len(calls) < 2 * NROWS
+    df = pd.read_csv("mobo_iteration_0_skipped.csv")
+    assert df[optimizer.skipped_header].all()
+
+
+def test_optimizer_sample_allocation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    qois = [QoI("qoi_x", lambda params: params["x"], 0.0)]
+    optimizer = _optimizer(qois)
+    df = _dataframe(optimizer)
+    df[optimizer.cluster_header] = np.repeat([-1, 0, 1], [10, 60, 30])
+    new_df = optimizer._sample(df, 0, 101)
+    origins = new_df[optimizer.origin_header].to_numpy()
+    # the whole budget is drawn and noise points are excluded
+    assert len(new_df) == 101
+    assert -1 not in set(origins)
+    assert abs(np.count_nonzero(origins == 0) - np.count_nonzero(origins == 1)) <= 1
+
+
+def test_optimizer_cluster_statistics(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    qois = [QoI("qoi_x", lambda params: params["x"], 0.0)]
+    optimizer = _optimizer(qois)
+    df = _dataframe(optimizer)
+    df[optimizer.parameter_headers] = np.where(
+        np.arange(NROWS).reshape(-1, 1) < NROWS // 2, -0.5, 0.5
+    ) + np.random.uniform(-0.1, 0.1, size=(NROWS, len(PARAMETERS)))
+    df[optimizer.cluster_header] = np.repeat([0, 1], NROWS // 2)
+    # half of the draws of the last model survived in the second cluster
+    df[optimizer.generation_header] = np.repeat([np.nan, 0], NROWS // 2)
+    # as many draws as survivors were filtered out of the first cluster
+    survived = df[optimizer.parameter_headers].to_numpy()[NROWS // 2:]
+    optimizer._generation = 1
+    optimizer._drawn[0] = np.vstack([survived, -survived])
+    sizes, survivors, draws = optimizer._cluster_statistics(df, [0, 1])
+    # draws which were filtered out count against their nearest cluster
+    assert list(sizes) == [NROWS // 2, NROWS // 2]
+    assert list(survivors) == [0, NROWS // 2]
+    assert list(draws) == [NROWS // 2, NROWS // 2]
+
+
+def test_optimizer_initial_data_columns(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    qois = [QoIGroup(
+        ["qoi_x", "qoi_y"], lambda params: [params["x"], params["y"]], [0.0, 0.0]
+    )]
+    optimizer = _optimizer(qois)
+    local_configurations = optimizer.configuration.local_configurations
+    local_configurations.append(local_configurations[0])
+    # initial data with only the parameter columns
+    df = _dataframe(optimizer)[optimizer.parameter_headers]
+    df.to_csv("initial_data.csv", index=False)
+    optimizer.configuration.initial_data_path = "initial_data.csv"
+    optimizer()
+    df = pd.read_csv("mobo_iteration_1.csv")
+    assert not df[optimizer.cluster_header].isna().any()
+
+
+def test_optimizer_exports_skipped(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    qois = [
+        QoI("cheap", lambda params: params["x"], 0.0),
+        QoI("expensive", lambda params: params["y"], 0.0, stage=1)
+    ]
+    optimizer = _optimizer(qois, prefilters=[PercentileFilter(50)])
+    optimizer()
+    df = pd.read_csv("mobo_iteration_0.csv")
+    skipped = pd.read_csv("mobo_iteration_0_skipped.csv")
+    assert len(df) + len(skipped) == NROWS
+    assert skipped[optimizer.skipped_header].all()
+    assert not skipped["cheap"].isna().any()
+    assert skipped["expensive_error"].isna().all()
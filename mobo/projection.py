@@ -1,13 +1,22 @@
 from abc import ABC
+from mobo.neighbors import NeighborGraph
 import numpy as np
+from sklearn.base import clone
 from sklearn.decomposition import PCA
 from sklearn.manifold import MDS, TSNE
 from typing import Callable, Optional, Union
 
 
 class BaseProjector(ABC):
-    """Abstract base class for Projectors."""
-    def __call__(self, data: np.ndarray) -> np.ndarray: 
+    """Abstract base class for Projectors.
+
+    Notes:
+        - `neighbors` is an optional neighbor graph computed over `data` 
+          which may be used in place of computing distances from scratch.
+    """
+    def __call__(self, 
+                 data: np.ndarray, 
+                 neighbors: Optional[NeighborGraph] = None) -> np.ndarray: 
         pass
 
 
@@ -35,9 +44,17 @@ class MDSProjector(BaseProjector):
                               eps=eps,
                               random_state=random_state,
                               dissimilarity=dissimilarity)
+        self._dissimilarity = dissimilarity
 
-    def __call__(self, data: np.ndarray) -> np.ndarray:
-        return self._projector.fit_transform(data)
+    def __call__(self, 
+                 data: np.ndarray, 
+                 neighbors: Optional[NeighborGraph] = None) -> np.ndarray:
+        if neighbors is None or self._dissimilarity != "euclidean":
+            return self._projector.fit_transform(data)
+        projector = clone(self._projector).set_params(
+            dissimilarity="precomputed"
+        )
+        return projector.fit_transform(neighbors.distances())
 
 
 class PCAProjector(BaseProjector):
@@ -60,7 +77,9 @@ class PCAProjector(BaseProjector):
                               iterated_power=iterated_power,
                               random_state=random_state)
 
-    def __call__(self, data: np.ndarray) -> np.ndarray:
+    def __call__(self, 
+                 data: np.ndarray, 
+                 neighbors: Optional[NeighborGraph] = None) -> np.ndarray:
         return self._projector.fit_transform(data)
 
 
@@ -97,6 +116,22 @@ class TSNEProjector(BaseProjector):
                                random_state=random_state,
                                method=method,
                                angle=angle)
+        self._perplexity = perplexity
+        self._metric = metric
+        self._init = init
+        self._method = method
 
-    def __call__(self, data: np.ndarray) -> np.ndarray:
-        return self._projector.fit_transform(data)
+    def __call__(self, 
+                 data: np.ndarray, 
+                 neighbors: Optional[NeighborGraph] = None) -> np.ndarray:
+        # pca initialization requires the raw data
+        if (neighbors is None or self._metric != "euclidean" 
+                or isinstance(self._init, str) and self._init == "pca"):
+            return self._projector.fit_transform(data)
+        projector = clone(self._projector).set_params(metric="precomputed")
+        if self._method == "exact":
+            return projector.fit_transform(neighbors.distances())
+        # same number of neighbors as the barnes-hut approximation uses
+        n_neighbors = int(3.0 * self._perplexity + 1)
+        graph = neighbors.kneighbors_graph(n_neighbors, include_self=True)
+        return projector.fit_transform(graph)
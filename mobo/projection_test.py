@@ -1,3 +1,4 @@
+from mobo.neighbors import NeighborGraph
 from mobo.projection import MDSProjector, PCAProjector, TSNEProjector
 import numpy as np
 
@@ -9,6 +10,8 @@ def test_mds_projector():
     mds = MDSProjector()
     projection = mds(DATA)
     assert projection.shape[0] == NROWS
+    projection = mds(DATA, NeighborGraph(DATA))
+    assert projection.shape[0] == NROWS
 
 
 def test_pca_projector():
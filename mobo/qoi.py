@@ -1,4 +1,5 @@
-from typing import Callable
+import numpy as np
+from typing import Callable, List, Mapping
 
 
 class QoI(object):
@@ -6,16 +7,84 @@ class QoI(object):
     
     Notes:
         - `evaluator` should expect a dict mapping parameter names to values.
+        - QoIs are evaluated in order of ascending `stage`. Cheap QoIs should 
+          be assigned a lower stage than expensive ones so that the 
+          `prefilters` of a `LocalConfiguration` can discard poor 
+          parameterizations before the expensive QoIs are evaluated.
 
     Args:
         name: Name of the qoi.
         evaluator: Evaluation function. 
         target: Target value of the qoi.
+        stage: Evaluation stage of the qoi.
     """
     def __init__(self, 
                  name: str,
                  evaluator: Callable, 
-                 target: float) -> None:
+                 target: float,
+                 stage: int = 0) -> None:
         self.name = name
         self.evaluator = evaluator
-        self.target = target
\ No newline at end of file
+        self.target = target
+        self.stage = stage
+
+    @property
+    def names(self) -> List[str]:
+        return [self.name]
+
+    @property
+    def targets(self) -> List[float]:
+        return [self.target]
+
+    def evaluate(self, parameterization: dict) -> np.ndarray:
+        """Evaluates the qoi.
+
+        Args:
+            parameterization: Mapping of parameter names to values.
+        """
+        return np.array([self.evaluator(parameterization)])
+
+
+class QoIGroup(object):
+    """Several quantities of interest computed by a single evaluation.
+
+    Notes:
+        - `evaluator` should expect a dict mapping parameter names to values.
+        - `evaluator` should return either a mapping of qoi names to values
+          or a sequence of values in the same order as `names`.
+
+    Args:
+        names: Name of each qoi.
+        evaluator: Evaluation function.
+        targets: Target value of each qoi.
+        stage: Evaluation stage of the qois.
+    """
+    def __init__(self,
+                 names: List[str],
+                 evaluator: Callable,
+                 targets: List[float],
+                 stage: int = 0) -> None:
+        if len(names) != len(targets):
+            err = "`names` and `targets` must have the same length."
+            raise ValueError(err)
+        self.names = names
+        self.evaluator = evaluator
+        self.targets = targets
+        self.stage = stage
+
+    def evaluate(self, parameterization: dict) -> np.ndarray:
+        """Evaluates each qoi in the group.
+
+        Args:
+            parameterization: Mapping of parameter names to values.
+        """
+        values = self.evaluator(parameterization)
+        if isinstance(values, Mapping):
+            values = [values[name] for name in self.names]
+        arr = np.asarray(values, dtype=float).reshape(-1)
+        if arr.shape[0] != len(self.names):
+            err = "`evaluator` returned {} values for {} qois.".format(
+                arr.shape[0], len(self.names)
+            )
+            raise ValueError(err)
+        return arr
@@ -0,0 +1,31 @@
+from mobo.qoi import QoI, QoIGroup
+import numpy as np
+import pytest
+
+PARAMETERIZATION = {"x": 1.0, "y": 2.0}
+
+
+def test_qoi():
+    qoi = QoI("sum", lambda params: params["x"] + params["y"], 0.0)
+    assert qoi.names == ["sum"]
+    assert np.array_equal(qoi.evaluate(PARAMETERIZATION), [3.0])
+
+
+def test_qoi_group_mapping():
+    evaluator = lambda params: {"y": params["y"], "x": params["x"]}
+    group = QoIGroup(["x", "y"], evaluator, [0.0, 0.0])
+    assert np.array_equal(group.evaluate(PARAMETERIZATION), [1.0, 2.0])
+
+
+def test_qoi_group_sequence():
+    evaluator = lambda params: [params["x"], params["y"]]
+    group = QoIGroup(["x", "y"], evaluator, [0.0, 0.0])
+    assert np.array_equal(group.evaluate(PARAMETERIZATION), [1.0, 2.0])
+
+
+def test_qoi_group_errors():
+    with pytest.raises(ValueError):
+        _ = QoIGroup(["x", "y"], lambda params: [0.0, 0.0], [0.0])
+    group = QoIGroup(["x", "y"], lambda params: [0.0], [0.0, 0.0])
+    with pytest.raises(ValueError):
+        _ = group.evaluate(PARAMETERIZATION)